@@ -79,6 +79,29 @@ setup_terraform_backend() {
     fi
 }
 
+# Compile commons/url_utils.py with mypyc inside the package directory.
+# The extension must match the Lambda runtime (python3.10, x86_64 Linux), so
+# the build is skipped on any other host; the .py module is always shipped
+# and is used whenever the extension is absent.
+compile_url_utils() {
+    local package_dir=$1
+
+    local host_runtime
+    host_runtime="$(python3 -c 'import sys; print("%d.%d" % sys.version_info[:2])')-$(uname -s)-$(uname -m)"
+    if [ "${host_runtime}" != "3.10-Linux-x86_64" ]; then
+        echo "Skipping mypyc build: host is ${host_runtime}, Lambda needs 3.10-Linux-x86_64"
+        return 0
+    fi
+
+    echo "Compiling commons/url_utils.py with mypyc..."
+    pip3 install --quiet mypy
+    (
+        cd "${package_dir}" &&
+        python3 -m mypyc commons/url_utils.py &&
+        rm -rf build .mypy_cache
+    ) || { echo "mypyc build failed"; exit 1; }
+}
+
 # Package Lambda functions
 package_lambda() {
     echo "Packaging Lambda functions..."
@@ -92,8 +115,18 @@ package_lambda() {
     # Copy source code
     cp -r src/* "${TEMP_DIR}/"
     
-    # Install dependencies
-    pip3 install -r src/requirements.txt -t "${TEMP_DIR}/" --upgrade
+    # Install dependencies as Lambda-compatible wheels so native packages
+    # (orjson) match the python3.10 x86_64 runtime, not the build host
+    pip3 install -r src/requirements.txt -t "${TEMP_DIR}/" --upgrade \
+        --platform manylinux2014_x86_64 \
+        --python-version 3.10 \
+        --implementation cp \
+        --only-binary=:all:
+    
+    # Optionally compile the per-request URL helpers to a C extension
+    if [ "${COMPILE_WITH_MYPYC:-false}" = "true" ]; then
+        compile_url_utils "${TEMP_DIR}"
+    fi
     
     # Create zip package
     cd "${TEMP_DIR}"
@@ -7,6 +7,7 @@ from .url_utils import (
     is_valid_url,
     calculate_expiry_date,
     is_expired,
+    is_expired_ts,
     SHORT_URL_LENGTH,
     DEFAULT_EXPIRY_DAYS,
     CUSTOM_SUFFIX_MAX_LENGTH,
@@ -16,8 +17,10 @@ from .url_utils import (
 from .lambda_utils import (
     get_base_url,
     extract_path_parameters,
+    extract_short_id_only,
     parse_request_body,
     create_json_response,
+    create_json_response_fast,
 # create_html_response removed
     create_redirect_response,
     create_error_response,
@@ -32,7 +35,10 @@ from .dynamodb_utils import (
     get_url_by_short_id,
     find_existing_url,
     create_url_mapping,
+    prepare_url_mapping,
+    put_url_mapping,
     update_click_count,
+    wait_for_pending_writes,
     delete_url_mapping,
     get_url_stats,
     DatabaseError
@@ -46,6 +52,7 @@ __all__ = [
     'is_valid_url', 
     'calculate_expiry_date',
     'is_expired',
+    'is_expired_ts',
     'SHORT_URL_LENGTH',
     'DEFAULT_EXPIRY_DAYS',
     'CUSTOM_SUFFIX_MAX_LENGTH',
@@ -54,8 +61,10 @@ __all__ = [
     # Lambda utilities
     'get_base_url',
     'extract_path_parameters',
+    'extract_short_id_only',
     'parse_request_body',
     'create_json_response',
+    'create_json_response_fast',
 # 'create_html_response' removed
     'create_redirect_response',
     'create_error_response',
@@ -69,7 +78,10 @@ __all__ = [
     'get_url_by_short_id',
     'find_existing_url',
     'create_url_mapping',
+    'prepare_url_mapping',
+    'put_url_mapping',
     'update_click_count',
+    'wait_for_pending_writes',
     'delete_url_mapping',
     'get_url_stats',
     'DatabaseError',
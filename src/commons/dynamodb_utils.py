@@ -3,30 +3,160 @@ DynamoDB utilities for URL shortener operations.
 """
 
 import os
+import time
 import boto3
-from typing import Optional, Dict, Any, List
-from datetime import datetime, timezone
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from itertools import chain
+from typing import Optional, Dict, Any, List, Callable
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from aws_lambda_powertools import Logger
 
 from .lambda_utils import LambdaError, NotFoundError, ConflictError, get_current_timestamp
-from .url_utils import is_expired
+from .url_utils import is_expired_ts
 
-# Initialize DynamoDB
-dynamodb = boto3.resource('dynamodb')
+# Keep-alive connections, a larger pool and short timeouts so warm invocations
+# reuse sockets instead of paying a TLS handshake, and slow calls fail fast
+_boto_config = Config(
+    region_name=os.environ.get('AWS_REGION'),
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=1.0,
+    read_timeout=1.5,
+    retries={'max_attempts': 2, 'mode': 'adaptive'}
+)
+
+# Initialize DynamoDB. These are module-level singletons, created once per
+# container during the init phase and reused across Lambda invocations.
+dynamodb = boto3.resource('dynamodb', config=_boto_config)
 table_name = os.environ.get('DYNAMODB_TABLE_NAME')
 table = dynamodb.Table(table_name) if table_name else None
 
+# Low-level client for the hot paths: requests are sent as pre-built
+# AttributeValue payloads, skipping the resource layer's (de)serializers
+_ddb = boto3.client('dynamodb', config=_boto_config)
+
 # Constants
 GSI_LONG_URL_INDEX = 'longUrl-index'
 MAX_RETRY_ATTEMPTS = 3
+BATCH_GET_MAX_KEYS = 100
+EXISTING_URL_QUERY_LIMIT = 5
+PENDING_WRITES_TIMEOUT_SECONDS = 2.0
+BATCH_RETRY_BASE_DELAY_SECONDS = 0.05
+URL_CACHE_MAX_SIZE = 4096
+URL_CACHE_TTL_SECONDS = 60
+NOT_FOUND_CACHE_TTL_SECONDS = 5
+EXISTING_URL_CACHE_MAX_SIZE = 1024
+
+# DynamoDB type of each known URL mapping attribute
+URL_ITEM_ATTRIBUTE_TYPES = {
+    'shortId': 'S',
+    'longUrl': 'S',
+    'createdAt': 'S',
+    'expiryDate': 'S',
+    'ttlTimestamp': 'N',
+    'clickCount': 'N',
+    'lastAccessedAt': 'S'
+}
+
+# Attributes every URL mapping item is guaranteed to have
+URL_ITEM_REQUIRED_ATTRIBUTES = ('shortId', 'longUrl')
+
+# Point reads fetch only the schema attributes the unmarshaller understands
+URL_ITEM_PROJECTION = ', '.join(URL_ITEM_ATTRIBUTE_TYPES)
 
 logger = Logger()
 
 
+def _create_dax_client(endpoint: str) -> Optional[Any]:
+    """
+    Create a DAX client for the given cluster endpoint.
+    
+    Args:
+        endpoint: DAX cluster endpoint URL
+        
+    Returns:
+        The DAX client, or None if it cannot be created
+    """
+    try:
+        from amazondax import AmazonDaxClient
+    except ImportError:
+        logger.warning("DAX_ENDPOINT is set but amazon-dax-client is not installed, using DynamoDB")
+        return None
+    
+    try:
+        return AmazonDaxClient(region_name=os.environ.get('AWS_REGION'), endpoint_url=endpoint)
+    except Exception as e:
+        logger.warning(f"Failed to create DAX client for {endpoint}, using DynamoDB: {e}")
+        return None
+
+
+# Single-item reads and writes go through DAX when a cluster endpoint is
+# configured. DAX is write-through, so routing the writes through it too keeps
+# its item cache from serving data the writes have replaced.
+DAX_ENDPOINT = os.environ.get('DAX_ENDPOINT')
+_item_client = (_create_dax_client(DAX_ENDPOINT) if DAX_ENDPOINT else None) or _ddb
+
+# Shared pool for overlapping independent DynamoDB calls; the low-level client
+# is thread-safe, unlike the resource/Table objects
+_executor = ThreadPoolExecutor(max_workers=8)
+
+# Futures of background writes still to be awaited by the handler
+_pending_writes: List[Future] = []
+
+
+class _TTLCache:
+    """Process-local LRU cache whose entries expire after a per-entry TTL."""
+    
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key: str, value: Any, ttl_seconds: float) -> None:
+        self._entries[key] = (value, time.monotonic() + ttl_seconds)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+    
+    def pop(self, key: str) -> None:
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Survives across invocations in a warm container, so repeated redirects
+# for the same short ID are served from memory instead of DynamoDB
+_url_cache = _TTLCache(URL_CACHE_MAX_SIZE)
+
+# Cached in place of an item for short IDs that do not exist, so repeated
+# 404s are served locally too; kept brief as the ID may be created elsewhere
+_NOT_FOUND = object()
+
+# Live mappings by long URL, so bursts of shorten requests for the same URL
+# skip the GSI query
+_existing_url_cache = _TTLCache(EXISTING_URL_CACHE_MAX_SIZE)
+
+
 class DatabaseError(LambdaError):
     """Exception for database operation errors."""
     
+    __slots__ = ('original_error',)
+    
     def __init__(self, message: str, original_error: Exception = None):
         super().__init__(f"Database error: {message}", 500)
         self.original_error = original_error
@@ -58,10 +188,53 @@ def _handle_client_error(error: ClientError, operation: str) -> None:
         raise DatabaseError(f"{operation} failed: {error_message}", error)
 
 
+def _compile_url_item_unmarshaller() -> Callable[[Dict[str, Dict[str, str]]], Dict[str, Any]]:
+    """
+    Generate a straight-line unmarshaller for the known URL mapping schema.
+    
+    The schema is fixed, so the per-attribute type dispatch is resolved once
+    at import and the generated function only does direct key access.
+    
+    Returns:
+        Function converting a low-level DynamoDB item into plain Python values
+    """
+    converters = {'S': "{}['S']", 'N': "int({}['N'])"}
+    
+    required = ', '.join(
+        f"{name!r}: " + converters[attribute_type].format(f"raw_item[{name!r}]")
+        for name, attribute_type in URL_ITEM_ATTRIBUTE_TYPES.items()
+        if name in URL_ITEM_REQUIRED_ATTRIBUTES
+    )
+    lines = [
+        'def _unmarshal_url_item(raw_item):',
+        f'    item = {{{required}}}'
+    ]
+    for name, attribute_type in URL_ITEM_ATTRIBUTE_TYPES.items():
+        if name in URL_ITEM_REQUIRED_ATTRIBUTES:
+            continue
+        lines += [
+            f'    value = raw_item.get({name!r})',
+            '    if value is not None:',
+            f'        item[{name!r}] = ' + converters[attribute_type].format('value')
+        ]
+    lines.append('    return item')
+    
+    namespace = {}
+    exec('\n'.join(lines), namespace)
+    return namespace['_unmarshal_url_item']
+
+
+# Converts a low-level DynamoDB item into a dict of the known URL mapping attributes
+_unmarshal_url_item = _compile_url_item_unmarshaller()
+
+
 def get_url_by_short_id(short_id: str) -> Optional[Dict[str, Any]]:
     """
     Retrieve URL mapping by short ID.
     
+    Warm containers serve repeated lookups, including misses, from a
+    process-local TTL cache.
+    
     Args:
         short_id: The short URL identifier
         
@@ -71,20 +244,54 @@ def get_url_by_short_id(short_id: str) -> Optional[Dict[str, Any]]:
     Raises:
         DatabaseError: If database operation fails
     """
-    if not table:
+    cached_item = _url_cache.get(short_id)
+    if cached_item is _NOT_FOUND:
+        return None
+    if cached_item is not None:
+        return cached_item
+    
+    if not table_name:
         raise DatabaseError("DynamoDB table not configured")
     
     try:
-        response = table.get_item(Key={'shortId': short_id})
-        return response.get('Item')
+        response = _item_client.get_item(
+            TableName=table_name,
+            Key={'shortId': {'S': short_id}},
+            ProjectionExpression=URL_ITEM_PROJECTION
+        )
     except ClientError as e:
         _handle_client_error(e, "get_item")
+    
+    raw_item = response.get('Item')
+    if not raw_item:
+        _url_cache.put(short_id, _NOT_FOUND, NOT_FOUND_CACHE_TTL_SECONDS)
+        return None
+    
+    item = _unmarshal_url_item(raw_item)
+    _cache_url_item(_url_cache, short_id, item)
+    return item
+
+
+def _cache_url_item(cache: _TTLCache, key: str, item: Dict[str, Any]) -> None:
+    """
+    Cache a URL mapping until its TTL or URL_CACHE_TTL_SECONDS, whichever is sooner.
+    
+    Items without a TTL or already past it are not cached so that expiry is
+    never masked by a stale entry.
+    """
+    remaining = int(item.get('ttlTimestamp', 0)) - int(time.time())
+    if remaining <= 0:
+        return
+    
+    cache.put(key, item, min(remaining, URL_CACHE_TTL_SECONDS))
 
 
 def find_existing_url(long_url: str) -> Optional[Dict[str, Any]]:
     """
     Find existing non-expired URL mapping by long URL using GSI.
     
+    Warm containers serve repeated lookups from a process-local TTL cache.
+    
     Args:
         long_url: The original long URL
         
@@ -94,31 +301,63 @@ def find_existing_url(long_url: str) -> Optional[Dict[str, Any]]:
     Raises:
         DatabaseError: If database operation fails
     """
+    cached_item = _existing_url_cache.get(long_url)
+    if cached_item is not None:
+        return cached_item
+    
     if not table:
         raise DatabaseError("DynamoDB table not configured")
     
     try:
-        # Use GSI query instead of expensive scan
+        # Use GSI query instead of expensive scan. No FilterExpression: it is
+        # applied after the read, so filtered-out items are still billed.
         response = table.query(
             IndexName=GSI_LONG_URL_INDEX,
             KeyConditionExpression=boto3.dynamodb.conditions.Key('longUrl').eq(long_url),
-            # Only return items that haven't expired
-            FilterExpression=boto3.dynamodb.conditions.Attr('ttlTimestamp').gt(
-                int(datetime.now(timezone.utc).timestamp())
-            )
+            ProjectionExpression='shortId, longUrl, expiryDate, ttlTimestamp',
+            Limit=EXISTING_URL_QUERY_LIMIT
         )
-        
-        items = response.get('Items', [])
-        
-        # Return the first non-expired item
-        for item in items:
-            if not is_expired(item.get('expiryDate', '')):
-                return item
-        
-        return None
-        
     except ClientError as e:
         _handle_client_error(e, "query_existing_url")
+    
+    # DynamoDB TTL deletion is lazy, so returned items may be past their expiry.
+    # Clean those up off the request path and return the first live one.
+    for item in response.get('Items', []):
+        if not is_expired_ts(item.get('ttlTimestamp', 0)):
+            _cache_url_item(_existing_url_cache, long_url, item)
+            return item
+        _executor.submit(_delete_expired_mapping, item['shortId'], long_url)
+    
+    return None
+
+
+def _delete_expired_mapping(short_id: str, long_url: str) -> None:
+    """
+    Best-effort delete of an expired URL mapping, run on the background executor.
+    
+    The delete is conditional: the GSI read that found the item is eventually
+    consistent, so by now the short ID may have been re-created for a live
+    mapping, which must not be removed.
+    
+    Args:
+        short_id: The short URL identifier
+        long_url: The long URL the expired mapping pointed to
+    """
+    try:
+        _item_client.delete_item(
+            TableName=table_name,
+            Key={'shortId': {'S': short_id}},
+            ConditionExpression='ttlTimestamp <= :now AND longUrl = :long_url',
+            ExpressionAttributeValues={
+                ':now': {'N': str(int(time.time()))},
+                ':long_url': {'S': long_url}
+            }
+        )
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            # Already gone, or replaced by a live mapping
+            return
+        logger.warning(f"Failed to delete expired mapping {short_id}: {e}")
 
 
 def create_url_mapping(
@@ -145,61 +384,160 @@ def create_url_mapping(
         ConflictError: If short_id already exists
         DatabaseError: If database operation fails
     """
-    if not table:
-        raise DatabaseError("DynamoDB table not configured")
+    prepared = prepare_url_mapping(long_url, expiry_date, ttl_timestamp, click_count)
+    return put_url_mapping(prepared, short_id)
+
+
+def prepare_url_mapping(
+    long_url: str,
+    expiry_date: str,
+    ttl_timestamp: int,
+    click_count: int = 0
+) -> Dict[str, Any]:
+    """
+    Build the short-ID-independent part of a new URL mapping.
+    
+    Prepare once and pass the result to put_url_mapping for every short ID
+    tried, so collision retries only add the shortId attribute.
     
-    item = {
-        'shortId': short_id,
-        'longUrl': long_url,
-        'createdAt': get_current_timestamp(),
-        'expiryDate': expiry_date,
-        'ttlTimestamp': ttl_timestamp,
-        'clickCount': click_count
+    Args:
+        long_url: The original long URL
+        expiry_date: ISO format expiry date
+        ttl_timestamp: Unix timestamp for TTL
+        click_count: Initial click count (default: 0)
+        
+    Returns:
+        Dict with the plain 'item' and its DynamoDB 'attributes' form
+    """
+    created_at = get_current_timestamp()
+    return {
+        'item': {
+            'longUrl': long_url,
+            'createdAt': created_at,
+            'expiryDate': expiry_date,
+            'ttlTimestamp': ttl_timestamp,
+            'clickCount': click_count
+        },
+        'attributes': {
+            'longUrl': {'S': long_url},
+            'createdAt': {'S': created_at},
+            'expiryDate': {'S': expiry_date},
+            'ttlTimestamp': {'N': str(ttl_timestamp)},
+            'clickCount': {'N': str(click_count)}
+        }
     }
+
+
+def put_url_mapping(prepared: Dict[str, Any], short_id: str) -> Dict[str, Any]:
+    """
+    Write a prepared URL mapping under the given short ID.
+    
+    Args:
+        prepared: Result of prepare_url_mapping
+        short_id: The short URL identifier
+        
+    Returns:
+        Dict containing the created item
+        
+    Raises:
+        ConflictError: If short_id already exists
+        DatabaseError: If database operation fails
+    """
+    if not table_name:
+        raise DatabaseError("DynamoDB table not configured")
     
     try:
-        table.put_item(
-            Item=item,
+        _item_client.put_item(
+            TableName=table_name,
+            Item={'shortId': {'S': short_id}, **prepared['attributes']},
             ConditionExpression='attribute_not_exists(shortId)'
         )
-        return item
-        
     except ClientError as e:
         _handle_client_error(e, "create_url_mapping")
+    
+    item = {'shortId': short_id, **prepared['item']}
+    _url_cache.pop(short_id)
+    _existing_url_cache.pop(item['longUrl'])
+    return item
 
 
 def update_click_count(short_id: str) -> bool:
     """
-    Increment click count and update last accessed timestamp.
+    Schedule a click count increment and last accessed timestamp update.
+    
+    The write runs on the background executor so the caller can overlap it
+    with the rest of its work. Lambda freezes the container once the handler
+    returns, and a write still in flight could then be lost or land late, so
+    handlers call wait_for_pending_writes before returning.
     
     Args:
         short_id: The short URL identifier
         
     Returns:
-        bool: True if update was successful, False otherwise
+        bool: True if the update was scheduled, False otherwise
     """
-    if not table:
+    if not table_name:
         logger.warning("DynamoDB table not configured, skipping click count update")
         return False
     
+    _pending_writes.append(
+        _executor.submit(_do_update_click_count, short_id, get_current_timestamp())
+    )
+    return True
+
+
+def _do_update_click_count(short_id: str, accessed_at: str) -> bool:
+    """
+    Increment click count and update last accessed timestamp.
+    
+    Args:
+        short_id: The short URL identifier
+        accessed_at: ISO timestamp of the click
+        
+    Returns:
+        bool: True if update was successful, False otherwise
+    """
     try:
-        table.update_item(
-            Key={'shortId': short_id},
-            UpdateExpression='SET clickCount = if_not_exists(clickCount, :zero) + :inc, lastAccessedAt = :timestamp',
+        # The write may run long after the redirect (e.g. a frozen container
+        # resuming), by which time TTL may have deleted the item; without the
+        # condition the update would recreate it as a bare, never-expiring stub
+        _item_client.update_item(
+            TableName=table_name,
+            Key={'shortId': {'S': short_id}},
+            UpdateExpression='ADD clickCount :inc SET lastAccessedAt = :timestamp',
+            ConditionExpression='attribute_exists(shortId)',
             ExpressionAttributeValues={
-                ':inc': 1,
-                ':zero': 0,
-                ':timestamp': get_current_timestamp()
+                ':inc': {'N': '1'},
+                ':timestamp': {'S': accessed_at}
             }
         )
         return True
         
     except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            # The mapping is gone; there is nothing to count
+            return False
         # Don't raise exception for click count updates - it's not critical
         logger.warning(f"Failed to update click count for {short_id}: {e}")
         return False
 
 
+def wait_for_pending_writes(timeout: float = PENDING_WRITES_TIMEOUT_SECONDS) -> None:
+    """
+    Wait for background writes scheduled by update_click_count.
+    
+    Args:
+        timeout: Maximum seconds to wait; unfinished writes are left running
+    """
+    if not _pending_writes:
+        return
+    
+    _, not_done = wait(_pending_writes, timeout=timeout)
+    if not_done:
+        logger.warning(f"{len(not_done)} background writes still pending after {timeout}s")
+    _pending_writes.clear()
+
+
 def delete_url_mapping(short_id: str) -> bool:
     """
     Delete URL mapping by short ID.
@@ -213,18 +551,25 @@ def delete_url_mapping(short_id: str) -> bool:
     Raises:
         DatabaseError: If database operation fails
     """
-    if not table:
+    if not table_name:
         raise DatabaseError("DynamoDB table not configured")
     
+    _url_cache.pop(short_id)
     try:
-        response = table.delete_item(
-            Key={'shortId': short_id},
+        response = _item_client.delete_item(
+            TableName=table_name,
+            Key={'shortId': {'S': short_id}},
             ReturnValues='ALL_OLD'
         )
-        return 'Attributes' in response
-        
     except ClientError as e:
         _handle_client_error(e, "delete_url_mapping")
+    
+    deleted_item = response.get('Attributes')
+    if not deleted_item:
+        return False
+    
+    _existing_url_cache.pop(_unmarshal_url_item(deleted_item)['longUrl'])
+    return True
 
 
 def get_url_stats(short_id: str) -> Optional[Dict[str, Any]]:
@@ -249,16 +594,55 @@ def get_url_stats(short_id: str) -> Optional[Dict[str, Any]]:
         'longUrl': item.get('longUrl'),
         'createdAt': item.get('createdAt'),
         'expiryDate': item.get('expiryDate'),
-        'clickCount': item.get('clickCount', 0),
+        'clickCount': int(item.get('clickCount', 0)),
         'lastAccessedAt': item.get('lastAccessedAt'),
-        'isExpired': is_expired(item.get('expiryDate', ''))
+        'isExpired': is_expired_ts(item.get('ttlTimestamp', 0))
+    }
+
+
+def _batch_get_chunk(short_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Fetch one batch_get_item chunk, retrying unprocessed keys with exponential backoff.
+    
+    Args:
+        short_ids: Up to BATCH_GET_MAX_KEYS short URL identifiers
+        
+    Returns:
+        List of URL mapping dictionaries
+        
+    Raises:
+        ClientError: If the DynamoDB call fails
+        DatabaseError: If keys remain unprocessed after all retries
+    """
+    request_items = {
+        table_name: {
+            'Keys': [{'shortId': {'S': short_id}} for short_id in short_ids],
+            'ProjectionExpression': URL_ITEM_PROJECTION
+        }
     }
+    raw_items = []
+    
+    for attempt in range(MAX_RETRY_ATTEMPTS + 1):
+        response = _ddb.batch_get_item(RequestItems=request_items)
+        raw_items.extend(response.get('Responses', {}).get(table_name, []))
+        
+        request_items = response.get('UnprocessedKeys')
+        if not request_items:
+            return [_unmarshal_url_item(raw_item) for raw_item in raw_items]
+        
+        if attempt < MAX_RETRY_ATTEMPTS:
+            time.sleep(BATCH_RETRY_BASE_DELAY_SECONDS * (2 ** attempt))
+    
+    unprocessed = len(request_items[table_name]['Keys'])
+    raise DatabaseError(f"batch_get_urls left {unprocessed} keys unprocessed")
 
 
 def batch_get_urls(short_ids: List[str]) -> List[Dict[str, Any]]:
     """
     Retrieve multiple URL mappings by short IDs.
     
+    Chunks are fetched in parallel, so the round-trips overlap.
+    
     Args:
         short_ids: List of short URL identifiers
         
@@ -268,31 +652,16 @@ def batch_get_urls(short_ids: List[str]) -> List[Dict[str, Any]]:
     Raises:
         DatabaseError: If database operation fails
     """
-    if not table or not short_ids:
+    if not table_name or not short_ids:
         return []
     
+    # DynamoDB batch_get_item has a limit of 100 items
+    batches = [
+        short_ids[i:i + BATCH_GET_MAX_KEYS]
+        for i in range(0, len(short_ids), BATCH_GET_MAX_KEYS)
+    ]
+    
     try:
-        # DynamoDB batch_get_item has a limit of 100 items
-        batch_size = 100
-        results = []
-        
-        for i in range(0, len(short_ids), batch_size):
-            batch = short_ids[i:i + batch_size]
-            
-            response = dynamodb.batch_get_item(
-                RequestItems={
-                    table_name: {
-                        'Keys': [{'shortId': short_id} for short_id in batch]
-                    }
-                }
-            )
-            
-            results.extend(response.get('Responses', {}).get(table_name, []))
-        
-        return results
-        
+        return list(chain.from_iterable(_executor.map(_batch_get_chunk, batches)))
     except ClientError as e:
         _handle_client_error(e, "batch_get_urls")
-
-
- 
\ No newline at end of file
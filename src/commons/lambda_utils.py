@@ -4,11 +4,34 @@ Common utilities for Lambda functions to eliminate code duplication.
 
 import json
 import os
+import re
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 from aws_lambda_powertools import Logger, Metrics
 from aws_lambda_powertools.metrics import MetricUnit
 
+# orjson (de)serializes several times faster than the stdlib; fall back if the
+# native wheel is not available in the deployment package. orjson's
+# JSONDecodeError subclasses json.JSONDecodeError, so callers catch either.
+try:
+    import orjson
+    
+    _loads = orjson.loads
+    
+    def _dumps(body: Any) -> str:
+        return orjson.dumps(body, default=str).decode('utf-8')
+    
+    def _dumps_strict(body: Any) -> str:
+        return orjson.dumps(body).decode('utf-8')
+except ImportError:
+    _loads = json.loads
+    
+    def _dumps(body: Any) -> str:
+        return json.dumps(body, default=str)
+    
+    def _dumps_strict(body: Any) -> str:
+        return json.dumps(body)
+
 # Constants
 HTTP_STATUS_OK = 200
 HTTP_STATUS_CREATED = 201
@@ -39,6 +62,15 @@ REDIRECT_HEADERS = {
     'Expires': '0'
 }
 
+# Proxy path: either stage/{stage}/tenant/{tenant}[/.../{resource}] or a bare {shortId}
+_PROXY_PATH_RE = re.compile(
+    r'/*(?:'
+    r'stage/+(?P<stage>[^/]+)/+tenant/+(?P<tenant>[^/]+)(?:/.*?(?P<resource>[^/]+))?'
+    r'|(?P<short_id>[^/]+)'
+    r')/*',
+    re.DOTALL  # segments may contain any character but '/', including newlines
+)
+
 
 def get_base_url(event: Dict[str, Any]) -> str:
     """
@@ -78,25 +110,47 @@ def extract_path_parameters(event: Dict[str, Any]) -> Tuple[Optional[str], Optio
     
     # If using proxy integration, extract from proxy path
     if 'proxy' in path_params:
-        proxy_path = path_params.get('proxy', '')
-        # Expected format: UrlShortner/stage/{stage}/tenant/{tenant}/shorten or /{shortId}
-        path_parts = [part for part in proxy_path.split('/') if part]
+        # Expected format: stage/{stage}/tenant/{tenant}/shorten or /{shortId}
+        match = _PROXY_PATH_RE.fullmatch(path_params.get('proxy') or '')
         
-        if len(path_parts) >= 4:
-            # Multi-tenant format: stage/{stage}/tenant/{tenant}/...
-            if len(path_parts) >= 4 and path_parts[0] == 'stage' and path_parts[2] == 'tenant':
-                stage = path_parts[1]
-                tenant = path_parts[3]
-                if len(path_parts) > 4:
-                    # Could be shortId or 'shorten' endpoint
-                    short_id = path_parts[-1] if path_parts[-1] != 'shorten' else None
-        elif len(path_parts) == 1:
+        if match and match['short_id']:
             # Simple format: just the shortId
-            short_id = path_parts[0]
+            short_id = match['short_id']
+        elif match:
+            # Multi-tenant format: stage/{stage}/tenant/{tenant}/...
+            stage, tenant, resource = match['stage'], match['tenant'], match['resource']
+            if resource:
+                # Could be shortId or 'shorten' endpoint
+                short_id = resource if resource != 'shorten' else None
     
     return short_id, stage, tenant
 
 
+def extract_short_id_only(event: Dict[str, Any]) -> Optional[str]:
+    """
+    Extract just the short ID from an API Gateway event.
+    
+    Equivalent to extract_path_parameters(event)[0] for callers, such as the
+    redirect handler, that have no use for stage and tenant.
+    
+    Args:
+        event: Lambda event object
+        
+    Returns:
+        The short ID, or None if not found
+    """
+    path_params = event.get('pathParameters', {})
+    if 'proxy' in path_params:
+        match = _PROXY_PATH_RE.fullmatch(path_params.get('proxy') or '')
+        if match and match['short_id']:
+            return match['short_id']
+        if match and match['resource']:
+            # Multi-tenant format: the last segment is a shortId or 'shorten'
+            return match['resource'] if match['resource'] != 'shorten' else None
+    
+    return path_params.get('shortId')
+
+
 def parse_request_body(event: Dict[str, Any]) -> Dict[str, Any]:
     """
     Parse and validate request body from Lambda event.
@@ -117,10 +171,7 @@ def parse_request_body(event: Dict[str, Any]) -> Dict[str, Any]:
         raise ValueError("Request body is required")
     
     if isinstance(body, str):
-        try:
-            return json.loads(body)
-        except json.JSONDecodeError as e:
-            raise json.JSONDecodeError(f"Invalid JSON in request body: {str(e)}", body, 0)
+        return _loads(body)
     elif isinstance(body, dict):
         return body
     else:
@@ -143,14 +194,44 @@ def create_json_response(
     Returns:
         Dict: Lambda response object
     """
-    headers = JSON_HEADERS.copy()
-    if additional_headers:
-        headers.update(additional_headers)
+    # Shared dict in the common case; callers must not mutate response headers
+    headers = {**JSON_HEADERS, **additional_headers} if additional_headers else JSON_HEADERS
+    
+    return {
+        'statusCode': status_code,
+        'headers': headers,
+        'body': _dumps(body)  # default=str handles Decimal and other unknown types
+    }
+
+
+def create_json_response_fast(
+    status_code: int,
+    body: Dict[str, Any],
+    additional_headers: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    Create a JSON response for a body made only of JSON-native types.
+    
+    Same as create_json_response but without the default=str fallback, so
+    serialization never calls back into Python for unknown types.
+    
+    Args:
+        status_code: HTTP status code
+        body: Response body of str/int/float/bool/None, lists and dicts
+        additional_headers: Optional additional headers
+        
+    Returns:
+        Dict: Lambda response object
+        
+    Raises:
+        TypeError: If body contains a type that is not JSON-native
+    """
+    headers = {**JSON_HEADERS, **additional_headers} if additional_headers else JSON_HEADERS
     
     return {
         'statusCode': status_code,
         'headers': headers,
-        'body': json.dumps(body, default=str)  # default=str handles datetime objects
+        'body': _dumps_strict(body)
     }
 
 
@@ -167,12 +248,9 @@ def create_redirect_response(location: str) -> Dict[str, Any]:
     Returns:
         Dict: Lambda response object
     """
-    headers = REDIRECT_HEADERS.copy()
-    headers['Location'] = location
-    
     return {
         'statusCode': 302,
-        'headers': headers,
+        'headers': {**REDIRECT_HEADERS, 'Location': location},
         'body': ''
     }
 
@@ -200,7 +278,7 @@ def create_error_response(
     logger.error(f"Error {status_code}: {error_message}")
     metrics.add_metric(name=metric_name, unit=MetricUnit.Count, value=1)
     
-    return create_json_response(
+    return create_json_response_fast(
         status_code=status_code,
         body={'error': error_message}
     )
@@ -219,15 +297,32 @@ def get_current_timestamp() -> str:
 class LambdaError(Exception):
     """Base exception class for Lambda function errors."""
     
+    # Slots keep attribute writes from allocating a per-instance __dict__;
+    # every subclass declares __slots__ for the same reason
+    __slots__ = ('message', 'status_code')
+    
     def __init__(self, message: str, status_code: int = HTTP_STATUS_INTERNAL_ERROR):
         self.message = message
         self.status_code = status_code
         super().__init__(message)
+    
+    def __reduce__(self):
+        # Slot values are not part of the default exception pickle state;
+        # BaseException still has a __dict__ (e.g. __notes__), so keep it too
+        state = dict(getattr(self, '__dict__', {}))
+        state['args'] = self.args
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return type(self), self.args, state
 
 
 class ValidationError(LambdaError):
     """Exception for validation errors."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str):
         super().__init__(message, HTTP_STATUS_BAD_REQUEST)
 
@@ -235,6 +330,8 @@ class ValidationError(LambdaError):
 class NotFoundError(LambdaError):
     """Exception for resource not found errors."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "Resource not found"):
         super().__init__(message, HTTP_STATUS_NOT_FOUND)
 
@@ -242,5 +339,7 @@ class NotFoundError(LambdaError):
 class ConflictError(LambdaError):
     """Exception for resource conflict errors."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "Resource conflict"):
         super().__init__(message, HTTP_STATUS_CONFLICT) 
\ No newline at end of file
@@ -1,21 +1,57 @@
-import hashlib
-import base64
 import re
+import secrets
+import string
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from decimal import Decimal
+from typing import Any, Optional, Tuple, Union
 
 # Constants to replace magic numbers
 SHORT_URL_LENGTH = 6
 DEFAULT_EXPIRY_DAYS = 60
-HASH_TRUNCATE_LENGTH = 16
-EXTENDED_HASH_LENGTH = 24
+# 5 random bytes encode to 7 URL-safe base64 characters
+SHORT_URL_RANDOM_BYTES = 5
 CUSTOM_SUFFIX_MAX_LENGTH = 20
 CUSTOM_SUFFIX_MIN_LENGTH = 3
+MAX_URL_LENGTH = 2048
+# Shortest URL the pattern below accepts, e.g. http://a.bc
+MIN_URL_LENGTH = 11
+
+# Translation table deleting every allowed custom suffix character, so a
+# valid suffix translates to an empty string
+_SUFFIX_ALLOWED_DELETE_TABLE = str.maketrans('', '', string.ascii_letters + string.digits + '_-')
+
+# Private IP ranges, blocked to prevent SSRF attacks. Matched from the host
+# position (after the scheme), so the pattern carries no scheme or anchor.
+_PRIVATE_IP_RE = re.compile(
+    r'(?:'
+    r'10\.|'                                    # 10.0.0.0/8
+    r'172\.(?:1[6-9]|2[0-9]|3[01])\.|'         # 172.16.0.0/12
+    r'192\.168\.|'                              # 192.168.0.0/16
+    r'127\.|'                                   # 127.0.0.0/8 (localhost)
+    r'169\.254\.|'                              # 169.254.0.0/16 (link-local)
+    r'0\.'                                      # 0.0.0.0/8
+    r')', re.IGNORECASE
+)
+
+# Basic URL pattern with improved IP validation, matched from the host position
+_URL_RE = re.compile(
+    r'(?:'
+    r'(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain
+    r'localhost|'  # localhost (but blocked above)
+    r'(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}'  # IP validation
+    r'(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)'  # Last IP octet
+    r')'
+    r'(?::[0-9]+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
 
 def generate_short_url(long_url: str, custom_suffix: Optional[str] = None) -> str:
     """
     Generate a short URL from a long URL.
     
+    Generated IDs are random rather than derived from long_url, so the
+    same URL may map to different IDs on separate calls.
+    
     Args:
         long_url (str): The original long URL
         custom_suffix (str, optional): Custom suffix for the short URL
@@ -35,26 +71,8 @@ def generate_short_url(long_url: str, custom_suffix: Optional[str] = None) -> st
             )
         return custom_suffix
     
-    # Create hash from URL and current timestamp for uniqueness
-    timestamp = str(datetime.now(timezone.utc).timestamp())
-    hash_input = f"{long_url}{timestamp}".encode('utf-8')
-    
-    # Generate SHA-256 hash
-    hash_object = hashlib.sha256(hash_input)
-    hash_hex = hash_object.hexdigest()
-    
-    # Convert to base64 and create short URL
-    hash_b64 = base64.urlsafe_b64encode(bytes.fromhex(hash_hex[:HASH_TRUNCATE_LENGTH])).decode('utf-8')
-    # Keep URL-safe characters but remove padding
-    clean_b64 = hash_b64.replace('=', '')
-    
-    # If after cleaning we have less than required characters, use more of the hash
-    if len(clean_b64) < SHORT_URL_LENGTH:
-        # Use more of the original hash
-        hash_b64 = base64.urlsafe_b64encode(bytes.fromhex(hash_hex[:EXTENDED_HASH_LENGTH])).decode('utf-8')
-        clean_b64 = hash_b64.replace('=', '')
-    
-    return clean_b64[:SHORT_URL_LENGTH]
+    # Random ID; collisions are caught by the conditional put in DynamoDB
+    return secrets.token_urlsafe(SHORT_URL_RANDOM_BYTES)[:SHORT_URL_LENGTH]
 
 
 def _is_valid_custom_suffix(suffix: str) -> bool:
@@ -67,62 +85,44 @@ def _is_valid_custom_suffix(suffix: str) -> bool:
     Returns:
         bool: True if valid, False otherwise
     """
-    if not suffix:
-        return False
-    
-    # Check length constraints
-    if len(suffix) < CUSTOM_SUFFIX_MIN_LENGTH or len(suffix) > CUSTOM_SUFFIX_MAX_LENGTH:
+    # Check length constraints (also rejects empty suffixes)
+    if not CUSTOM_SUFFIX_MIN_LENGTH <= len(suffix) <= CUSTOM_SUFFIX_MAX_LENGTH:
         return False
     
     # Check for alphanumeric characters only (plus hyphens and underscores)
-    pattern = re.compile(r'^[a-zA-Z0-9_-]+$')
-    return bool(pattern.match(suffix))
+    return not suffix.translate(_SUFFIX_ALLOWED_DELETE_TABLE)
 
 
-def is_valid_url(url: str) -> bool:
+def is_valid_url(url: Any) -> bool:
     """
     Validate if a URL is properly formatted and secure.
     
     Args:
-        url (str): URL to validate
+        url (Any): URL to validate; non-string values are rejected
         
     Returns:
         bool: True if URL is valid, False otherwise
     """
-    if not url or not isinstance(url, str) or len(url) > 2048:
+    # Cheap type, length and scheme checks before touching the regex engine
+    if not isinstance(url, str) or not MIN_URL_LENGTH <= len(url) <= MAX_URL_LENGTH:
         return False
     
-    # Block private IP ranges to prevent SSRF attacks
-    private_ip_pattern = re.compile(
-        r'^https?://(?:'
-        r'10\.|'                                    # 10.0.0.0/8
-        r'172\.(?:1[6-9]|2[0-9]|3[01])\.|'         # 172.16.0.0/12
-        r'192\.168\.|'                              # 192.168.0.0/16
-        r'127\.|'                                   # 127.0.0.0/8 (localhost)
-        r'169\.254\.|'                              # 169.254.0.0/16 (link-local)
-        r'0\.'                                      # 0.0.0.0/8
-        r')', re.IGNORECASE
-    )
-    
-    if private_ip_pattern.match(url):
+    scheme = url[:8].lower()
+    if scheme == 'https://':
+        host_start = 8
+    elif scheme.startswith('http://'):
+        host_start = 7
+    else:
         return False
     
-    # Basic URL pattern with improved IP validation
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:'
-        r'(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain
-        r'localhost|'  # localhost (but blocked above)
-        r'(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}'  # IP validation
-        r'(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)'  # Last IP octet
-        r')'
-        r'(?::[0-9]+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+    # Block private IP ranges to prevent SSRF attacks
+    if _PRIVATE_IP_RE.match(url, host_start):
+        return False
     
-    return bool(url_pattern.match(url))
+    return bool(_URL_RE.match(url, host_start))
 
 
-def calculate_expiry_date(days: int = DEFAULT_EXPIRY_DAYS) -> str:
+def calculate_expiry_date(days: int = DEFAULT_EXPIRY_DAYS) -> Tuple[str, int]:
     """
     Calculate expiry date from current time.
     
@@ -130,7 +130,7 @@ def calculate_expiry_date(days: int = DEFAULT_EXPIRY_DAYS) -> str:
         days (int): Number of days from now for expiry (default: 60)
         
     Returns:
-        str: ISO format expiry date
+        Tuple[str, int]: ISO format expiry date and its Unix timestamp (for TTL)
         
     Raises:
         ValueError: If days is not positive
@@ -139,13 +139,30 @@ def calculate_expiry_date(days: int = DEFAULT_EXPIRY_DAYS) -> str:
         raise ValueError(f"Days must be positive, got: {days}")
     
     expiry_date = datetime.now(timezone.utc) + timedelta(days=days)
-    return expiry_date.isoformat()
+    return expiry_date.isoformat(), int(expiry_date.timestamp())
 
 
-def is_expired(expiry_date: str) -> bool:
+def is_expired_ts(ttl_timestamp: Union[int, Decimal]) -> bool:
+    """
+    Check if a URL has expired using its epoch TTL timestamp.
+    
+    Args:
+        ttl_timestamp (int | Decimal): Unix timestamp at which the URL expires;
+            boto3 resource reads return it as a Decimal
+        
+    Returns:
+        bool: True if expired, False otherwise
+    """
+    return ttl_timestamp <= int(time.time())
+
+
+def is_expired(expiry_date: Optional[str]) -> bool:
     """
     Check if a URL has expired.
     
+    Prefer is_expired_ts when the item's ttlTimestamp is available; this
+    parses the ISO string and is kept for externally supplied dates.
+    
     Args:
         expiry_date (str): ISO format expiry date
         
@@ -156,21 +173,15 @@ def is_expired(expiry_date: str) -> bool:
         return True
     
     try:
-        # Handle both timezone-aware and naive datetime strings
+        # Python 3.10's fromisoformat does not accept a trailing 'Z'
         if expiry_date.endswith('Z'):
             expiry_date = expiry_date[:-1] + '+00:00'
-        elif '+' not in expiry_date and 'T' in expiry_date:
-            # Assume UTC if no timezone info
-            expiry_date = expiry_date + '+00:00'
-            
         expiry = datetime.fromisoformat(expiry_date)
-        current_time = datetime.now(timezone.utc)
-        
-        # Ensure both datetimes are timezone-aware for comparison
         if expiry.tzinfo is None:
+            # Assume UTC if no timezone info
             expiry = expiry.replace(tzinfo=timezone.utc)
         
-        return current_time > expiry
-    except (ValueError, TypeError) as e:
-        # Log the error in production, but for now just return expired
-        return True  # If we can't parse the date, consider it expired 
\ No newline at end of file
+        return expiry.timestamp() < time.time()
+    except (ValueError, TypeError):
+        # If we can't parse the date, consider it expired
+        return True
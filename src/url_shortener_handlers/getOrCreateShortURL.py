@@ -1,5 +1,6 @@
 import json
-from datetime import datetime, timezone
+import random
+import time
 from aws_lambda_powertools import Logger, Tracer, Metrics
 from aws_lambda_powertools.logging import correlation_paths
 from aws_lambda_powertools.metrics import MetricUnit
@@ -7,13 +8,13 @@ from aws_lambda_powertools.metrics import MetricUnit
 from commons.url_utils import generate_short_url, is_valid_url, calculate_expiry_date, is_expired
 from commons.lambda_utils import (
     get_base_url, extract_path_parameters, parse_request_body,
-    create_json_response, create_error_response, get_current_timestamp,
+    create_json_response_fast, create_error_response,
     ValidationError, ConflictError, LambdaError,
     HTTP_STATUS_OK, HTTP_STATUS_CREATED, HTTP_STATUS_BAD_REQUEST, 
     HTTP_STATUS_CONFLICT, HTTP_STATUS_INTERNAL_ERROR
 )
 from commons.dynamodb_utils import (
-    find_existing_url, create_url_mapping, get_url_by_short_id,
+    find_existing_url, prepare_url_mapping, put_url_mapping, get_url_by_short_id,
     DatabaseError
 )
 
@@ -25,6 +26,18 @@ metrics = Metrics(namespace="UrlShortenerService")
 # Constants
 DEFAULT_EXPIRY_DAYS = 60
 MAX_COLLISION_RETRIES = 3
+COLLISION_BACKOFF_BASE_SECONDS = 0.01
+COLLISION_BACKOFF_MAX_SECONDS = 0.1
+
+# Handled exceptions -> (metric name, error message, status code); a None
+# message or status code falls back to the exception's own attribute
+_ERROR_MAP = {
+    ValidationError: ("ValidationErrors", None, None),
+    ConflictError: ("CustomSuffixConflict", None, None),
+    DatabaseError: ("DatabaseErrors", "Database operation failed", None),
+    json.JSONDecodeError: ("JsonParseErrors", "Invalid JSON format", HTTP_STATUS_BAD_REQUEST),
+}
+_HANDLED_ERRORS = tuple(_ERROR_MAP)
 
 
 @tracer.capture_lambda_handler
@@ -52,8 +65,9 @@ def lambda_handler(event, context):
     try:
         # Extract path information for multi-tenant support
         short_id, stage, tenant = extract_path_parameters(event)
+        base_url = get_base_url(event)
         if stage and tenant:
-            logger.info(f"Request from stage: {stage}, tenant: {tenant}")
+            logger.info("Request from stage: %s, tenant: %s", stage, tenant)
         
         # Parse and validate request body
         body = parse_request_body(event)
@@ -70,11 +84,10 @@ def lambda_handler(event, context):
         # Check if URL already exists (using GSI query instead of scan)
         existing_item = find_existing_url(long_url)
         if existing_item:
-            logger.info(f"Found existing non-expired short URL for: {long_url}")
+            logger.info("Found existing non-expired short URL for: %s", long_url)
             metrics.add_metric(name="ExistingUrlReturned", unit=MetricUnit.Count, value=1)
             
-            base_url = get_base_url(event)
-            return create_json_response(
+            return create_json_response_fast(
                 status_code=HTTP_STATUS_OK,
                 body={
                     'shortUrl': f"{base_url}/{existing_item['shortId']}",
@@ -90,11 +103,10 @@ def lambda_handler(event, context):
             custom_suffix=custom_suffix
         )
         
-        logger.info(f"Created new short URL: {short_id} -> {long_url}")
+        logger.info("Created new short URL: %s -> %s", short_id, long_url)
         metrics.add_metric(name="NewUrlCreated", unit=MetricUnit.Count, value=1)
         
-        base_url = get_base_url(event)
-        return create_json_response(
+        return create_json_response_fast(
             status_code=HTTP_STATUS_CREATED,
             body={
                 'shortUrl': f"{base_url}/{short_id}",
@@ -104,44 +116,21 @@ def lambda_handler(event, context):
             }
         )
         
-    except ValidationError as e:
-        return create_error_response(
-            status_code=e.status_code,
-            error_message=e.message,
-            logger=logger,
-            metrics=metrics,
-            metric_name="ValidationErrors"
-        )
-        
-    except ConflictError as e:
-        return create_error_response(
-            status_code=e.status_code,
-            error_message=e.message,
-            logger=logger,
-            metrics=metrics,
-            metric_name="CustomSuffixConflict"
-        )
-        
-    except DatabaseError as e:
-        return create_error_response(
-            status_code=e.status_code,
-            error_message="Database operation failed",
-            logger=logger,
-            metrics=metrics,
-            metric_name="DatabaseErrors"
+    except _HANDLED_ERRORS as e:
+        # Most specific mapped class wins, e.g. orjson's JSONDecodeError subclass
+        metric_name, error_message, status_code = next(
+            _ERROR_MAP[cls] for cls in type(e).__mro__ if cls in _ERROR_MAP
         )
-        
-    except json.JSONDecodeError as e:
         return create_error_response(
-            status_code=HTTP_STATUS_BAD_REQUEST,
-            error_message="Invalid JSON format",
+            status_code=status_code or e.status_code,
+            error_message=error_message or e.message,
             logger=logger,
             metrics=metrics,
-            metric_name="JsonParseErrors"
+            metric_name=metric_name
         )
         
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+        logger.error("Unexpected error: %s", e, exc_info=True)
         return create_error_response(
             status_code=HTTP_STATUS_INTERNAL_ERROR,
             error_message="Internal server error",
@@ -168,11 +157,10 @@ def create_short_url_with_retry(long_url: str, custom_suffix: str = None) -> tup
         ValidationError: If custom suffix is invalid
     """
     # Calculate expiry date and TTL timestamp
-    expiry_date = calculate_expiry_date(DEFAULT_EXPIRY_DAYS)
-    expiry_datetime = datetime.fromisoformat(expiry_date.replace('Z', '+00:00') if expiry_date.endswith('Z') else expiry_date)
-    if expiry_datetime.tzinfo is None:
-        expiry_datetime = expiry_datetime.replace(tzinfo=timezone.utc)
-    ttl_timestamp = int(expiry_datetime.timestamp())
+    expiry_date, ttl_timestamp = calculate_expiry_date(DEFAULT_EXPIRY_DAYS)
+    
+    # Everything but the short ID is the same across collision retries
+    prepared_mapping = prepare_url_mapping(long_url, expiry_date, ttl_timestamp)
     
     for attempt in range(MAX_COLLISION_RETRIES):
         # Generate short ID
@@ -180,18 +168,18 @@ def create_short_url_with_retry(long_url: str, custom_suffix: str = None) -> tup
             # Only try custom suffix on first attempt
             short_id = generate_short_url(long_url, custom_suffix)
         else:
-            # Generate random short ID, adding entropy for retries
-            entropy_suffix = f"_{attempt}_{get_current_timestamp()}" if attempt > 0 else ""
-            short_id = generate_short_url(f"{long_url}{entropy_suffix}")
+            # Random IDs come from secrets, so each retry draws a fresh one
+            short_id = generate_short_url(long_url)
+        
+        if attempt > 0:
+            # Full-jitter backoff so concurrent colliding writers spread out
+            time.sleep(random.uniform(
+                0, min(COLLISION_BACKOFF_MAX_SECONDS, COLLISION_BACKOFF_BASE_SECONDS * 2 ** attempt)
+            ))
         
         try:
             # Create URL mapping atomically - DynamoDB handles the race condition
-            created_item = create_url_mapping(
-                short_id=short_id,
-                long_url=long_url,
-                expiry_date=expiry_date,
-                ttl_timestamp=ttl_timestamp
-            )
+            created_item = put_url_mapping(prepared_mapping, short_id)
             
             return short_id, created_item
             
@@ -202,11 +190,11 @@ def create_short_url_with_retry(long_url: str, custom_suffix: str = None) -> tup
             
             if attempt == MAX_COLLISION_RETRIES - 1:
                 # Last attempt failed
-                logger.error(f"Failed to create short URL after {MAX_COLLISION_RETRIES} attempts")
+                logger.error("Failed to create short URL after %d attempts", MAX_COLLISION_RETRIES)
                 raise DatabaseError("Unable to generate unique short URL after multiple attempts")
             
             # Log collision and retry
-            logger.warning(f"Short ID collision detected on attempt {attempt + 1}: {short_id}")
+            logger.warning("Short ID collision detected on attempt %d: %s", attempt + 1, short_id)
             metrics.add_metric(name="ShortIdCollision", unit=MetricUnit.Count, value=1)
     
     # This should never be reached due to the exception handling above
@@ -3,14 +3,16 @@ from aws_lambda_powertools import Logger, Tracer, Metrics
 from aws_lambda_powertools.logging import correlation_paths
 from aws_lambda_powertools.metrics import MetricUnit
 
-from commons.url_utils import is_expired
+from commons.url_utils import is_expired, is_expired_ts
 from commons.lambda_utils import (
-    extract_path_parameters, create_json_response, create_redirect_response,
+    extract_short_id_only, create_json_response, create_redirect_response,
     create_error_response, ValidationError, LambdaError,
     HTTP_STATUS_BAD_REQUEST, HTTP_STATUS_NOT_FOUND, HTTP_STATUS_GONE, 
     HTTP_STATUS_INTERNAL_ERROR
 )
-from commons.dynamodb_utils import get_url_by_short_id, update_click_count, DatabaseError
+from commons.dynamodb_utils import (
+    get_url_by_short_id, update_click_count, wait_for_pending_writes, DatabaseError
+)
 
 # Initialize powertools
 logger = Logger()
@@ -35,16 +37,16 @@ def lambda_handler(event, context):
     
     try:
         # Extract short ID from path parameters
-        short_id, stage, tenant = extract_path_parameters(event)
+        short_id = extract_short_id_only(event)
         
         if not short_id:
             raise ValidationError("Missing short URL identifier")
         
-        # Look up the short URL in DynamoDB
+        # Look up the short URL; warm containers usually answer from memory
         item = get_url_by_short_id(short_id)
         
         if not item:
-            logger.info(f"Short URL not found: {short_id}")
+            logger.info("Short URL not found: %s", short_id)
             metrics.add_metric(name="UrlNotFound", unit=MetricUnit.Count, value=1)
             
             return create_json_response(
@@ -58,10 +60,15 @@ def lambda_handler(event, context):
         
         long_url = item.get('longUrl')
         expiry_date = item.get('expiryDate')
+        ttl_timestamp = item.get('ttlTimestamp')
         
-        # Check if URL has expired
-        if is_expired(expiry_date):
-            logger.info(f"Short URL expired: {short_id}")
+        # Check if URL has expired; ttlTimestamp is the epoch form of expiryDate
+        if ttl_timestamp is not None:
+            expired = is_expired_ts(ttl_timestamp)
+        else:
+            expired = is_expired(expiry_date)
+        if expired:
+            logger.info("Short URL expired: %s", short_id)
             metrics.add_metric(name="UrlExpired", unit=MetricUnit.Count, value=1)
             
             return create_json_response(
@@ -74,15 +81,17 @@ def lambda_handler(event, context):
                 }
             )
         
-        # Update click count (fire-and-forget)
-        click_updated = update_click_count(short_id)
-        if not click_updated:
-            logger.warning(f"Failed to update click count for {short_id}")
+        # Update click count in the background; failures are logged by the worker
+        update_click_count(short_id)
         
         # Log successful redirect
-        logger.info(f"Redirecting {short_id} to {long_url[:50]}...")  # Truncate for security
+        logger.info("Redirecting %s to %.50s...", short_id, long_url)  # Truncate for security
         metrics.add_metric(name="SuccessfulRedirects", unit=MetricUnit.Count, value=1)
         
+        # Lambda freezes the container after returning, so give the click write
+        # a bounded wait to land first
+        wait_for_pending_writes()
+        
         # Return 302 redirect
         return create_redirect_response(long_url)
         
@@ -96,7 +105,7 @@ def lambda_handler(event, context):
         )
         
     except DatabaseError as e:
-        logger.error(f"Database error for {short_id}: {str(e)}")
+        logger.error("Database error for %s: %s", short_id, e)
         metrics.add_metric(name="DatabaseErrors", unit=MetricUnit.Count, value=1)
         
         return create_json_response(
@@ -108,7 +117,7 @@ def lambda_handler(event, context):
         )
         
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+        logger.error("Unexpected error: %s", e, exc_info=True)
         metrics.add_metric(name="UnexpectedErrors", unit=MetricUnit.Count, value=1)
         
         return create_json_response(
@@ -0,0 +1,507 @@
+import unittest
+import sys
+import os
+import time
+from unittest import mock
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# boto3 clients are created at import and need a region
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from botocore.stub import ANY, Stubber
+
+from commons import dynamodb_utils
+from commons.dynamodb_utils import (
+    _TTLCache, _cache_url_item, _unmarshal_url_item, _batch_get_chunk, _delete_expired_mapping,
+    _create_dax_client, _do_update_click_count, get_url_by_short_id, find_existing_url,
+    create_url_mapping, update_click_count, wait_for_pending_writes, delete_url_mapping, DatabaseError,
+    GSI_LONG_URL_INDEX, EXISTING_URL_QUERY_LIMIT, MAX_RETRY_ATTEMPTS, URL_CACHE_TTL_SECONDS,
+    URL_ITEM_PROJECTION
+)
+
+TABLE_NAME = 'UrlMappings'
+
+
+class TestTTLCache(unittest.TestCase):
+    
+    def test_get_missing_key(self):
+        """Test a missing key returns None"""
+        cache = _TTLCache(max_size=2)
+        self.assertIsNone(cache.get('missing'))
+    
+    def test_entry_expires_after_ttl(self):
+        """Test entries are dropped once their TTL has passed"""
+        cache = _TTLCache(max_size=2)
+        with mock.patch.object(dynamodb_utils.time, 'monotonic', return_value=100.0):
+            cache.put('abc123', 'value', ttl_seconds=10)
+        
+        with mock.patch.object(dynamodb_utils.time, 'monotonic', return_value=109.0):
+            self.assertEqual(cache.get('abc123'), 'value')
+        
+        with mock.patch.object(dynamodb_utils.time, 'monotonic', return_value=110.0):
+            self.assertIsNone(cache.get('abc123'))
+    
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted when full"""
+        cache = _TTLCache(max_size=2)
+        cache.put('a', 1, ttl_seconds=60)
+        cache.put('b', 2, ttl_seconds=60)
+        
+        # Reading 'a' makes 'b' the least recently used entry
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3, ttl_seconds=60)
+        
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+    
+    def test_pop_and_clear(self):
+        """Test pop removes one entry and clear removes all"""
+        cache = _TTLCache(max_size=4)
+        cache.put('a', 1, ttl_seconds=60)
+        cache.put('b', 2, ttl_seconds=60)
+        
+        cache.pop('a')
+        cache.pop('missing')  # Popping a missing key is a no-op
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 2)
+        
+        cache.clear()
+        self.assertIsNone(cache.get('b'))
+
+
+class TestCacheUrlItem(unittest.TestCase):
+    
+    def test_caches_live_item(self):
+        """Test a live item is cached"""
+        cache = _TTLCache(max_size=4)
+        item = {'shortId': 'abc123', 'ttlTimestamp': int(time.time()) + 3600}
+        
+        _cache_url_item(cache, 'abc123', item)
+        self.assertEqual(cache.get('abc123'), item)
+    
+    def test_cache_ttl_capped(self):
+        """Test a live item is cached for at most URL_CACHE_TTL_SECONDS"""
+        cache = _TTLCache(max_size=4)
+        item = {'shortId': 'abc123', 'ttlTimestamp': int(time.time()) + 3600}
+        
+        with mock.patch.object(dynamodb_utils.time, 'monotonic', return_value=100.0):
+            _cache_url_item(cache, 'abc123', item)
+        
+        with mock.patch.object(dynamodb_utils.time, 'monotonic', return_value=100.0 + URL_CACHE_TTL_SECONDS):
+            self.assertIsNone(cache.get('abc123'))
+    
+    def test_skips_expired_item(self):
+        """Test an item past its TTL is not cached"""
+        cache = _TTLCache(max_size=4)
+        item = {'shortId': 'abc123', 'ttlTimestamp': int(time.time()) - 1}
+        
+        _cache_url_item(cache, 'abc123', item)
+        self.assertIsNone(cache.get('abc123'))
+    
+    def test_skips_item_without_ttl(self):
+        """Test an item without ttlTimestamp is not cached"""
+        cache = _TTLCache(max_size=4)
+        
+        _cache_url_item(cache, 'abc123', {'shortId': 'abc123'})
+        self.assertIsNone(cache.get('abc123'))
+
+
+class TestUnmarshalUrlItem(unittest.TestCase):
+    
+    def test_full_item(self):
+        """Test every known attribute is converted to its Python type"""
+        raw_item = {
+            'shortId': {'S': 'abc123'},
+            'longUrl': {'S': 'https://example.com'},
+            'createdAt': {'S': '2024-01-01T00:00:00+00:00'},
+            'expiryDate': {'S': '2024-03-01T00:00:00+00:00'},
+            'ttlTimestamp': {'N': '1709251200'},
+            'clickCount': {'N': '42'},
+            'lastAccessedAt': {'S': '2024-01-02T00:00:00+00:00'}
+        }
+        
+        self.assertEqual(_unmarshal_url_item(raw_item), {
+            'shortId': 'abc123',
+            'longUrl': 'https://example.com',
+            'createdAt': '2024-01-01T00:00:00+00:00',
+            'expiryDate': '2024-03-01T00:00:00+00:00',
+            'ttlTimestamp': 1709251200,
+            'clickCount': 42,
+            'lastAccessedAt': '2024-01-02T00:00:00+00:00'
+        })
+    
+    def test_optional_attributes_absent(self):
+        """Test absent optional attributes are left out rather than set to None"""
+        raw_item = {'shortId': {'S': 'abc123'}, 'longUrl': {'S': 'https://example.com'}}
+        
+        self.assertEqual(
+            _unmarshal_url_item(raw_item),
+            {'shortId': 'abc123', 'longUrl': 'https://example.com'}
+        )
+    
+    def test_unknown_attributes_ignored(self):
+        """Test attributes outside the URL mapping schema are dropped"""
+        raw_item = {
+            'shortId': {'S': 'abc123'},
+            'longUrl': {'S': 'https://example.com'},
+            'owner': {'S': 'someone'}
+        }
+        
+        self.assertNotIn('owner', _unmarshal_url_item(raw_item))
+    
+    def test_required_attributes_indexed_directly(self):
+        """Test the generated unmarshaller relies on shortId and longUrl being present"""
+        with self.assertRaises(KeyError):
+            _unmarshal_url_item({'shortId': {'S': 'abc123'}})
+
+
+class DynamoDBStubTestCase(unittest.TestCase):
+    """Base class wiring the module's DynamoDB clients to botocore Stubbers."""
+    
+    def setUp(self):
+        resource_table = dynamodb_utils.dynamodb.Table(TABLE_NAME)
+        for name, value in (
+            ('table_name', TABLE_NAME),
+            ('table', resource_table),
+            ('_item_client', dynamodb_utils._ddb),
+        ):
+            patcher = mock.patch.object(dynamodb_utils, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.client_stub = Stubber(dynamodb_utils._ddb)
+        self.client_stub.activate()
+        self.addCleanup(self.client_stub.deactivate)
+        
+        self.table_stub = Stubber(resource_table.meta.client)
+        self.table_stub.activate()
+        self.addCleanup(self.table_stub.deactivate)
+        
+        dynamodb_utils._url_cache.clear()
+        dynamodb_utils._existing_url_cache.clear()
+        self.addCleanup(dynamodb_utils._url_cache.clear)
+        self.addCleanup(dynamodb_utils._existing_url_cache.clear)
+    
+    def tearDown(self):
+        self.client_stub.assert_no_pending_responses()
+        self.table_stub.assert_no_pending_responses()
+
+
+class TestGetUrlByShortId(DynamoDBStubTestCase):
+    
+    def _raw_item(self, short_id, ttl_timestamp):
+        return {
+            'shortId': {'S': short_id},
+            'longUrl': {'S': 'https://example.com'},
+            'expiryDate': {'S': '2030-01-01T00:00:00+00:00'},
+            'ttlTimestamp': {'N': str(ttl_timestamp)}
+        }
+    
+    def _expect_get_item(self, short_id, response):
+        self.client_stub.add_response(
+            'get_item',
+            response,
+            {
+                'TableName': TABLE_NAME,
+                'Key': {'shortId': {'S': short_id}},
+                'ProjectionExpression': URL_ITEM_PROJECTION
+            }
+        )
+    
+    def test_hit_is_served_from_cache(self):
+        """Test a found item is fetched once and then served from the cache"""
+        ttl_timestamp = int(time.time()) + 3600
+        self._expect_get_item('abc123', {'Item': self._raw_item('abc123', ttl_timestamp)})
+        
+        expected = {
+            'shortId': 'abc123',
+            'longUrl': 'https://example.com',
+            'expiryDate': '2030-01-01T00:00:00+00:00',
+            'ttlTimestamp': ttl_timestamp
+        }
+        self.assertEqual(get_url_by_short_id('abc123'), expected)
+        # No second stubbed response: this must come from the cache
+        self.assertEqual(get_url_by_short_id('abc123'), expected)
+    
+    def test_miss_is_cached_as_not_found(self):
+        """Test a missing short ID is looked up once and then answered locally"""
+        self._expect_get_item('missing', {})
+        
+        self.assertIsNone(get_url_by_short_id('missing'))
+        self.assertIsNone(get_url_by_short_id('missing'))
+    
+    def test_expired_item_is_not_cached(self):
+        """Test an item past its TTL is re-read rather than cached"""
+        ttl_timestamp = int(time.time()) - 1
+        self._expect_get_item('old123', {'Item': self._raw_item('old123', ttl_timestamp)})
+        self._expect_get_item('old123', {'Item': self._raw_item('old123', ttl_timestamp)})
+        
+        self.assertEqual(get_url_by_short_id('old123')['ttlTimestamp'], ttl_timestamp)
+        self.assertEqual(get_url_by_short_id('old123')['ttlTimestamp'], ttl_timestamp)
+    
+    def test_create_invalidates_cached_entries(self):
+        """Test creating a mapping drops cached entries for its short ID and long URL"""
+        dynamodb_utils._url_cache.put('abc123', dynamodb_utils._NOT_FOUND, 60)
+        dynamodb_utils._existing_url_cache.put('https://example.com', {'shortId': 'old123'}, 60)
+        self.client_stub.add_response(
+            'put_item',
+            {},
+            {
+                'TableName': TABLE_NAME,
+                'Item': {
+                    'shortId': {'S': 'abc123'},
+                    'longUrl': {'S': 'https://example.com'},
+                    'createdAt': ANY,
+                    'expiryDate': {'S': '2030-01-01T00:00:00+00:00'},
+                    'ttlTimestamp': {'N': '1893456000'},
+                    'clickCount': {'N': '0'}
+                },
+                'ConditionExpression': 'attribute_not_exists(shortId)'
+            }
+        )
+        
+        item = create_url_mapping('abc123', 'https://example.com', '2030-01-01T00:00:00+00:00', 1893456000)
+        self.assertEqual(item['shortId'], 'abc123')
+        self.assertIsNone(dynamodb_utils._url_cache.get('abc123'))
+        self.assertIsNone(dynamodb_utils._existing_url_cache.get('https://example.com'))
+    
+    def test_delete_invalidates_cached_entries(self):
+        """Test deleting a mapping drops cached entries for its short ID and long URL"""
+        dynamodb_utils._url_cache.put('abc123', {'shortId': 'abc123'}, 60)
+        dynamodb_utils._existing_url_cache.put('https://example.com', {'shortId': 'abc123'}, 60)
+        self.client_stub.add_response(
+            'delete_item',
+            {'Attributes': {'shortId': {'S': 'abc123'}, 'longUrl': {'S': 'https://example.com'}}},
+            {'TableName': TABLE_NAME, 'Key': {'shortId': {'S': 'abc123'}}, 'ReturnValues': 'ALL_OLD'}
+        )
+        
+        self.assertTrue(delete_url_mapping('abc123'))
+        self.assertIsNone(dynamodb_utils._url_cache.get('abc123'))
+        self.assertIsNone(dynamodb_utils._existing_url_cache.get('https://example.com'))
+
+
+class TestDaxClient(DynamoDBStubTestCase):
+    
+    def test_item_reads_and_writes_share_one_client(self):
+        """Test point reads and every item write go through the same client"""
+        item_client = mock.Mock()
+        item_client.get_item.return_value = {}
+        item_client.delete_item.return_value = {
+            'Attributes': {'shortId': {'S': 'abc123'}, 'longUrl': {'S': 'https://example.com'}}
+        }
+        
+        # Nothing is queued on the _ddb stub, so any call that bypasses the
+        # item client fails the test
+        with mock.patch.object(dynamodb_utils, '_item_client', item_client):
+            get_url_by_short_id('abc123')
+            create_url_mapping('abc123', 'https://example.com', '2030-01-01T00:00:00+00:00', 1893456000)
+            _do_update_click_count('abc123', '2024-01-01T00:00:00+00:00')
+            _delete_expired_mapping('old123', 'https://example.com')
+            delete_url_mapping('abc123')
+        
+        item_client.get_item.assert_called_once()
+        item_client.put_item.assert_called_once()
+        item_client.update_item.assert_called_once()
+        self.assertEqual(item_client.delete_item.call_count, 2)
+    
+    def test_create_dax_client(self):
+        """Test a DAX client is built for the configured endpoint"""
+        amazondax = mock.Mock()
+        with mock.patch.dict(sys.modules, {'amazondax': amazondax}):
+            client = _create_dax_client('dax://cluster.example.com')
+        
+        self.assertIs(client, amazondax.AmazonDaxClient.return_value)
+        amazondax.AmazonDaxClient.assert_called_once_with(
+            region_name=ANY, endpoint_url='dax://cluster.example.com'
+        )
+    
+    def test_create_dax_client_not_installed(self):
+        """Test a missing amazon-dax-client falls back to DynamoDB"""
+        with mock.patch.dict(sys.modules, {'amazondax': None}):
+            self.assertIsNone(_create_dax_client('dax://cluster.example.com'))
+    
+    def test_create_dax_client_construction_fails(self):
+        """Test a DAX client that fails to construct falls back to DynamoDB"""
+        amazondax = mock.Mock()
+        amazondax.AmazonDaxClient.side_effect = ValueError('bad endpoint')
+        with mock.patch.dict(sys.modules, {'amazondax': amazondax}):
+            self.assertIsNone(_create_dax_client('not-an-endpoint'))
+
+
+class TestFindExistingUrl(DynamoDBStubTestCase):
+    
+    def _expect_query(self, items):
+        self.table_stub.add_response(
+            'query',
+            {'Items': items},
+            {
+                'TableName': TABLE_NAME,
+                'IndexName': GSI_LONG_URL_INDEX,
+                'KeyConditionExpression': ANY,
+                'ProjectionExpression': 'shortId, longUrl, expiryDate, ttlTimestamp',
+                'Limit': EXISTING_URL_QUERY_LIMIT
+            }
+        )
+    
+    def _raw_item(self, short_id, ttl_timestamp):
+        return {
+            'shortId': {'S': short_id},
+            'longUrl': {'S': 'https://example.com'},
+            'expiryDate': {'S': '2030-01-01T00:00:00+00:00'},
+            'ttlTimestamp': {'N': str(ttl_timestamp)}
+        }
+    
+    def test_skips_expired_items(self):
+        """Test expired items are skipped, queued for deletion, and the live one returned"""
+        now = int(time.time())
+        self._expect_query([
+            self._raw_item('old123', now - 10),
+            self._raw_item('new123', now + 3600)
+        ])
+        
+        with mock.patch.object(dynamodb_utils, '_executor') as executor:
+            item = find_existing_url('https://example.com')
+        
+        self.assertEqual(item['shortId'], 'new123')
+        executor.submit.assert_called_once_with(_delete_expired_mapping, 'old123', 'https://example.com')
+        
+        # Served from the cache on the next call
+        self.assertEqual(find_existing_url('https://example.com')['shortId'], 'new123')
+    
+    def test_only_expired_items(self):
+        """Test None is returned when every matching item has expired"""
+        self._expect_query([self._raw_item('old123', int(time.time()) - 10)])
+        
+        with mock.patch.object(dynamodb_utils, '_executor'):
+            self.assertIsNone(find_existing_url('https://example.com'))
+    
+    def test_delete_expired_mapping_is_conditional(self):
+        """Test the background delete only removes a still-expired mapping for the same URL"""
+        self.client_stub.add_client_error(
+            'delete_item',
+            service_error_code='ConditionalCheckFailedException',
+            expected_params={
+                'TableName': TABLE_NAME,
+                'Key': {'shortId': {'S': 'old123'}},
+                'ConditionExpression': 'ttlTimestamp <= :now AND longUrl = :long_url',
+                'ExpressionAttributeValues': {
+                    ':now': ANY,
+                    ':long_url': {'S': 'https://example.com'}
+                }
+            }
+        )
+        
+        # A re-created live mapping fails the condition; that is not an error
+        self.assertIsNone(_delete_expired_mapping('old123', 'https://example.com'))
+
+
+class TestBatchGetChunk(DynamoDBStubTestCase):
+    
+    def _keys(self, *short_ids):
+        return {
+            TABLE_NAME: {
+                'Keys': [{'shortId': {'S': short_id}} for short_id in short_ids],
+                'ProjectionExpression': URL_ITEM_PROJECTION
+            }
+        }
+    
+    def _raw_item(self, short_id):
+        return {'shortId': {'S': short_id}, 'longUrl': {'S': f'https://example.com/{short_id}'}}
+    
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(dynamodb_utils.time, 'sleep')
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_retries_unprocessed_keys(self):
+        """Test unprocessed keys are retried with backoff and results combined"""
+        self.client_stub.add_response(
+            'batch_get_item',
+            {
+                'Responses': {TABLE_NAME: [self._raw_item('a')]},
+                'UnprocessedKeys': self._keys('b')
+            },
+            {'RequestItems': self._keys('a', 'b')}
+        )
+        self.client_stub.add_response(
+            'batch_get_item',
+            {'Responses': {TABLE_NAME: [self._raw_item('b')]}, 'UnprocessedKeys': {}},
+            {'RequestItems': self._keys('b')}
+        )
+        
+        items = _batch_get_chunk(['a', 'b'])
+        
+        self.assertEqual([item['shortId'] for item in items], ['a', 'b'])
+        self.sleep.assert_called_once()
+    
+    def test_raises_when_keys_stay_unprocessed(self):
+        """Test DatabaseError is raised once retries are exhausted"""
+        for _ in range(MAX_RETRY_ATTEMPTS + 1):
+            self.client_stub.add_response(
+                'batch_get_item',
+                {'Responses': {TABLE_NAME: []}, 'UnprocessedKeys': self._keys('a')},
+                {'RequestItems': self._keys('a')}
+            )
+        
+        with self.assertRaises(DatabaseError):
+            _batch_get_chunk(['a'])
+        
+        self.assertEqual(self.sleep.call_count, MAX_RETRY_ATTEMPTS)
+
+
+class TestUpdateClickCount(DynamoDBStubTestCase):
+    
+    def test_write_runs_on_executor(self):
+        """Test the update is submitted to the executor and tracked as pending"""
+        future = mock.Mock()
+        with mock.patch.object(dynamodb_utils, '_executor') as executor, \
+                mock.patch.object(dynamodb_utils, '_pending_writes', []) as pending_writes:
+            executor.submit.return_value = future
+            self.assertTrue(update_click_count('abc123'))
+        
+        executor.submit.assert_called_once_with(_do_update_click_count, 'abc123', ANY)
+        self.assertEqual(pending_writes, [future])
+    
+    def _expected_params(self, short_id):
+        return {
+            'TableName': TABLE_NAME,
+            'Key': {'shortId': {'S': short_id}},
+            'UpdateExpression': 'ADD clickCount :inc SET lastAccessedAt = :timestamp',
+            'ConditionExpression': 'attribute_exists(shortId)',
+            'ExpressionAttributeValues': {
+                ':inc': {'N': '1'},
+                ':timestamp': {'S': '2024-01-01T00:00:00+00:00'}
+            }
+        }
+    
+    def test_increments_existing_mapping(self):
+        """Test the click count update succeeds for an existing mapping"""
+        self.client_stub.add_response('update_item', {}, self._expected_params('abc123'))
+        
+        self.assertTrue(_do_update_click_count('abc123', '2024-01-01T00:00:00+00:00'))
+    
+    def test_deleted_mapping_is_not_recreated(self):
+        """Test a mapping deleted before the write fails the condition quietly"""
+        self.client_stub.add_client_error(
+            'update_item',
+            service_error_code='ConditionalCheckFailedException',
+            expected_params=self._expected_params('gone123')
+        )
+        
+        self.assertFalse(_do_update_click_count('gone123', '2024-01-01T00:00:00+00:00'))
+    
+    def test_wait_for_pending_writes(self):
+        """Test waiting completes outstanding writes and clears the pending list"""
+        with mock.patch.object(dynamodb_utils, '_pending_writes', []) as pending_writes:
+            pending_writes.append(dynamodb_utils._executor.submit(time.sleep, 0.01))
+            wait_for_pending_writes(timeout=1)
+            
+            self.assertEqual(pending_writes, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
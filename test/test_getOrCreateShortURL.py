@@ -0,0 +1,87 @@
+import unittest
+import json
+import sys
+import os
+from unittest import mock
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# boto3 clients are created at import and need a region; keep X-Ray out of tests
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('POWERTOOLS_TRACE_DISABLED', 'true')
+os.environ.setdefault('BASE_URL', 'https://short.example.com')
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from url_shortener_handlers import getOrCreateShortURL as handler
+from commons.lambda_utils import (
+    ValidationError, ConflictError,
+    HTTP_STATUS_BAD_REQUEST, HTTP_STATUS_CONFLICT, HTTP_STATUS_INTERNAL_ERROR
+)
+from commons.dynamodb_utils import DatabaseError
+
+
+class FakeLambdaContext:
+    function_name = 'getOrCreateShortURL'
+    memory_limit_in_mb = 128
+    invoked_function_arn = 'arn:aws:lambda:us-east-1:123456789012:function:getOrCreateShortURL'
+    aws_request_id = 'test-request-id'
+
+
+class TestErrorDispatch(unittest.TestCase):
+    
+    def setUp(self):
+        patcher = mock.patch.object(handler.metrics, 'add_metric')
+        self.add_metric = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def _invoke(self, body):
+        event = {'body': json.dumps(body), 'headers': {}}
+        return handler.lambda_handler(event, FakeLambdaContext())
+    
+    def _assert_error(self, response, status_code, error_message, metric_name):
+        self.assertEqual(response['statusCode'], status_code)
+        self.assertEqual(json.loads(response['body']), {'error': error_message})
+        self.add_metric.assert_called_once_with(name=metric_name, unit=mock.ANY, value=1)
+    
+    def test_validation_error(self):
+        """Test ValidationError keeps its own message and status code"""
+        response = self._invoke({})
+        
+        self._assert_error(
+            response, HTTP_STATUS_BAD_REQUEST, 'Missing required field: longUrl', 'ValidationErrors'
+        )
+    
+    def test_conflict_error(self):
+        """Test ConflictError keeps its own message and status code"""
+        with mock.patch.object(handler, 'find_existing_url', return_value=None), \
+                mock.patch.object(handler, 'put_url_mapping', side_effect=ConflictError('Custom suffix taken')):
+            response = self._invoke({'longUrl': 'https://example.com', 'customSuffix': 'my-link'})
+        
+        self._assert_error(response, HTTP_STATUS_CONFLICT, 'Custom suffix taken', 'CustomSuffixConflict')
+    
+    def test_database_error(self):
+        """Test DatabaseError is reported with a generic message"""
+        with mock.patch.object(handler, 'find_existing_url', side_effect=DatabaseError('query failed')):
+            response = self._invoke({'longUrl': 'https://example.com'})
+        
+        self._assert_error(
+            response, HTTP_STATUS_INTERNAL_ERROR, 'Database operation failed', 'DatabaseErrors'
+        )
+    
+    @unittest.skipUnless(orjson, "orjson is not installed")
+    def test_orjson_decode_error(self):
+        """Test orjson's JSONDecodeError subclass maps to the JSON parse error entry"""
+        decode_error = orjson.JSONDecodeError('unexpected character', '{not json', 1)
+        with mock.patch.object(handler, 'parse_request_body', side_effect=decode_error):
+            response = self._invoke({})
+        
+        self._assert_error(response, HTTP_STATUS_BAD_REQUEST, 'Invalid JSON format', 'JsonParseErrors')
+
+
+if __name__ == '__main__':
+    unittest.main()
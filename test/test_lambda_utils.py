@@ -7,8 +7,8 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from commons.lambda_utils import (
-    get_base_url, extract_path_parameters, parse_request_body,
-    create_json_response, create_redirect_response,
+    get_base_url, extract_path_parameters, extract_short_id_only, parse_request_body,
+    create_json_response, create_json_response_fast, create_redirect_response,
     create_error_response, get_current_timestamp,
     ValidationError, ConflictError, LambdaError, NotFoundError,
     HTTP_STATUS_OK, HTTP_STATUS_CREATED, HTTP_STATUS_BAD_REQUEST,
@@ -91,6 +91,19 @@ class TestLambdaUtils(unittest.TestCase):
         self.assertEqual(stage, 'prod')
         self.assertEqual(tenant, 'company1')
     
+    def test_extract_path_parameters_proxy_newline_segment(self):
+        """Test multi-tenant proxy paths whose middle segments contain newlines"""
+        event = {
+            'pathParameters': {
+                'proxy': 'stage/prod/tenant/company1/a\nb/abc123'
+            }
+        }
+        
+        short_id, stage, tenant = extract_path_parameters(event)
+        self.assertEqual(short_id, 'abc123')
+        self.assertEqual(stage, 'prod')
+        self.assertEqual(tenant, 'company1')
+    
     def test_extract_path_parameters_empty(self):
         """Test extracting path parameters from empty event"""
         event = {}
@@ -100,6 +113,23 @@ class TestLambdaUtils(unittest.TestCase):
         self.assertIsNone(stage)
         self.assertIsNone(tenant)
     
+    def test_extract_short_id_only(self):
+        """Test extracting only the short ID matches extract_path_parameters"""
+        events = [
+            {},
+            {'pathParameters': {'shortId': 'abc123'}},
+            {'pathParameters': {'proxy': 'abc123'}},
+            {'pathParameters': {'proxy': 'stage/prod/tenant/company1/abc123'}},
+            {'pathParameters': {'proxy': 'stage/prod/tenant/company1/shorten'}},
+            {'pathParameters': {'proxy': 'stage/prod/tenant/company1', 'shortId': 'abc123'}},
+        ]
+        
+        for event in events:
+            with self.subTest(event=event):
+                self.assertEqual(extract_short_id_only(event), extract_path_parameters(event)[0])
+        
+        self.assertEqual(extract_short_id_only(events[3]), 'abc123')
+    
     def test_parse_request_body_json_string(self):
         """Test parsing JSON string request body"""
         event = {
@@ -168,6 +198,19 @@ class TestLambdaUtils(unittest.TestCase):
         self.assertEqual(response['headers']['X-Custom-Header'], 'custom-value')
         self.assertEqual(response['headers']['Content-Type'], 'application/json')
     
+    def test_create_json_response_fast(self):
+        """Test creating JSON response for a JSON-native body"""
+        body = {'shortUrl': 'https://short.example.com/abc123', 'created': True}
+        response = create_json_response_fast(HTTP_STATUS_CREATED, body)
+        
+        self.assertEqual(response['statusCode'], HTTP_STATUS_CREATED)
+        self.assertEqual(response['headers']['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response['body']), body)
+        
+        # No default=str fallback for non-JSON types
+        with self.assertRaises(TypeError):
+            create_json_response_fast(HTTP_STATUS_OK, {'value': object()})
+    
     # HTML response test removed - using JSON-only approach
     
     def test_create_redirect_response(self):
@@ -238,6 +281,26 @@ class TestLambdaUtils(unittest.TestCase):
         self.assertEqual(error.message, "Resource conflict")
         self.assertEqual(error.status_code, HTTP_STATUS_CONFLICT)
     
+    def test_lambda_error_pickle_round_trip(self):
+        """Test slotted exceptions keep their attributes through pickling"""
+        import pickle
+        
+        error = pickle.loads(pickle.dumps(LambdaError("Test error", HTTP_STATUS_BAD_REQUEST)))
+        self.assertEqual(error.message, "Test error")
+        self.assertEqual(error.status_code, HTTP_STATUS_BAD_REQUEST)
+        self.assertEqual(str(error), "Test error")
+        
+        error = pickle.loads(pickle.dumps(ConflictError("Resource conflict")))
+        self.assertIsInstance(error, ConflictError)
+        self.assertEqual(error.message, "Resource conflict")
+        self.assertEqual(error.status_code, HTTP_STATUS_CONFLICT)
+        
+        original = ValidationError("Invalid input")
+        original.request_id = "req-123"
+        error = pickle.loads(pickle.dumps(original))
+        self.assertEqual(error.request_id, "req-123")
+        self.assertEqual(error.status_code, HTTP_STATUS_BAD_REQUEST)
+    
     def test_constants_are_defined(self):
         """Test that HTTP status constants are properly defined"""
         self.assertEqual(HTTP_STATUS_OK, 200)
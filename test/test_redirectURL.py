@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+import time
+from unittest import mock
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# boto3 clients are created at import and need a region; keep X-Ray out of tests
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('POWERTOOLS_TRACE_DISABLED', 'true')
+
+from url_shortener_handlers import redirectURL as handler
+
+
+class FakeLambdaContext:
+    function_name = 'redirectURL'
+    memory_limit_in_mb = 128
+    invoked_function_arn = 'arn:aws:lambda:us-east-1:123456789012:function:redirectURL'
+    aws_request_id = 'test-request-id'
+
+
+class TestRedirect(unittest.TestCase):
+    
+    def setUp(self):
+        self.db = mock.Mock()
+        self.db.get_url_by_short_id.return_value = {
+            'shortId': 'abc123',
+            'longUrl': 'https://example.com',
+            'expiryDate': '2030-01-01T00:00:00+00:00',
+            'ttlTimestamp': int(time.time()) + 3600
+        }
+        for name in ('get_url_by_short_id', 'update_click_count', 'wait_for_pending_writes'):
+            patcher = mock.patch.object(handler, name, getattr(self.db, name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        patcher = mock.patch.object(handler.metrics, 'add_metric')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def _invoke(self, short_id):
+        event = {'pathParameters': {'shortId': short_id}, 'headers': {}}
+        return handler.lambda_handler(event, FakeLambdaContext())
+    
+    def test_waits_for_click_write_before_redirecting(self):
+        """Test the click write is scheduled and awaited before the 302 is returned"""
+        response = self._invoke('abc123')
+        
+        self.assertEqual(response['statusCode'], 302)
+        self.assertEqual(response['headers']['Location'], 'https://example.com')
+        self.assertEqual(self.db.mock_calls, [
+            mock.call.get_url_by_short_id('abc123'),
+            mock.call.update_click_count('abc123'),
+            mock.call.wait_for_pending_writes()
+        ])
+    
+    def test_not_found_skips_click_write(self):
+        """Test a missing short ID neither counts a click nor waits"""
+        self.db.get_url_by_short_id.return_value = None
+        
+        response = self._invoke('missing')
+        
+        self.assertEqual(response['statusCode'], 404)
+        self.db.update_click_count.assert_not_called()
+        self.db.wait_for_pending_writes.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
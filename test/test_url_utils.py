@@ -6,7 +6,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from commons.url_utils import (
-    generate_short_url, is_valid_url, calculate_expiry_date, is_expired,
+    generate_short_url, is_valid_url, calculate_expiry_date, is_expired, is_expired_ts,
     SHORT_URL_LENGTH, DEFAULT_EXPIRY_DAYS, CUSTOM_SUFFIX_MAX_LENGTH, CUSTOM_SUFFIX_MIN_LENGTH
 )
 from datetime import datetime, timedelta, timezone
@@ -117,7 +117,7 @@ class TestUrlUtils(unittest.TestCase):
     
     def test_calculate_expiry_date_default(self):
         """Test expiry date calculation with default days"""
-        expiry_date = calculate_expiry_date()
+        expiry_date, ttl_timestamp = calculate_expiry_date()
         expiry_datetime = datetime.fromisoformat(expiry_date.replace('Z', '+00:00') if expiry_date.endswith('Z') else expiry_date)
         
         # Should be approximately DEFAULT_EXPIRY_DAYS from now
@@ -126,11 +126,14 @@ class TestUrlUtils(unittest.TestCase):
         
         # Allow 5 seconds difference for test execution time
         self.assertLess(time_diff, 5, "Expiry date should be close to expected default")
+        
+        # TTL timestamp should match the ISO expiry date
+        self.assertEqual(ttl_timestamp, int(expiry_datetime.timestamp()))
     
     def test_calculate_expiry_date_custom_days(self):
         """Test expiry date calculation with custom days"""
         custom_days = 30
-        expiry_date = calculate_expiry_date(custom_days)
+        expiry_date, ttl_timestamp = calculate_expiry_date(custom_days)
         expiry_datetime = datetime.fromisoformat(expiry_date.replace('Z', '+00:00') if expiry_date.endswith('Z') else expiry_date)
         
         expected_date = datetime.now(timezone.utc) + timedelta(days=custom_days)
@@ -188,6 +191,24 @@ class TestUrlUtils(unittest.TestCase):
         # Test explicit UTC timezone
         utc_future = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
         self.assertFalse(is_expired(utc_future))
+    
+    def test_is_expired_negative_offset(self):
+        """Test expiry checking with negative UTC offsets"""
+        self.assertFalse(is_expired('2999-01-01T00:00:00-05:00'))
+        self.assertTrue(is_expired('2000-01-01T00:00:00-05:00'))
+        
+        # One hour ahead in UTC-05:00 is still in the future
+        offset_future = (datetime.now(timezone(timedelta(hours=-5))) + timedelta(hours=1)).isoformat()
+        self.assertFalse(is_expired(offset_future))
+
+    
+    def test_is_expired_ts(self):
+        """Test expiry checking with epoch TTL timestamps"""
+        now = int(datetime.now(timezone.utc).timestamp())
+        
+        self.assertFalse(is_expired_ts(now + 3600))
+        self.assertTrue(is_expired_ts(now - 3600))
+        self.assertTrue(is_expired_ts(0))
 
 
 if __name__ == '__main__':